@@ -3,7 +3,7 @@
 from collections import defaultdict
 from collections.abc import Callable
 
-from slugify import slugify
+from .utils import cached_slugify
 
 
 class BaseObject:
@@ -49,7 +49,7 @@ class BaseObject:
             str: The slugified path of the object.
 
         """
-        return slugify(getattr(self, "slug", self._title))
+        return cached_slugify(getattr(self, "slug", self._title))
 
     @property
     def extension(self) -> str:
@@ -103,22 +103,13 @@ class BaseObject:
             dict: A dictionary of the object's attributes.
 
         """
-        base_dict = {
+        return {
             **vars(self),
             "title": self._title,
             "slug": self._slug,
             "url": self.url_for(),
             "path_name": self.path_name,
+            # Pull out template_vars and plugin_settings
+            **getattr(self, "template_vars", {}),
+            **getattr(self, "plugin_settings", {}),
         }
-
-        # Pull out template_vars
-        if hasattr(self, "template_vars"):
-            for key, value in self.template_vars.items():
-                base_dict[key] = value
-
-        # Pull out plugin_settings
-        if hasattr(self, "plugin_settings"):
-            for key, value in self.plugin_settings.items():
-                base_dict[key] = value
-
-        return base_dict
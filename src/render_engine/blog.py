@@ -1,3 +1,5 @@
+import heapq
+
 from render_engine_markdown import MarkdownPageParser
 
 from .collection import Collection
@@ -32,11 +34,5 @@ class Blog(Collection):
 
     def latest(self, count: int = 1) -> list[Collection]:
         """Get the latest post from the collection."""
-        latest_pages = list(
-            sorted(
-                self.__iter__(),
-                key=lambda x: getattr(x, self.sort_by),
-                reverse=self.sort_reverse,
-            )
-        )[0:count]
-        return latest_pages
+        select = heapq.nlargest if self.sort_reverse else heapq.nsmallest
+        return select(count, self, key=lambda x: getattr(x, self.sort_by))
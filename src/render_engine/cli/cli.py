@@ -17,11 +17,11 @@ from render_engine.site import Site
 app = typer.Typer()
 
 
-def get_site_content_paths(site: Site) -> list[Path | None]:
+def get_site_content_paths(site: Site) -> list[Path | str]:
     """Get the content paths from the route_list in the Site"""
 
-    base_paths = map(lambda x: getattr(x, "content_path", None), site.route_list.values())
-    return list(filter(lambda x: x is not None, base_paths))
+    base_paths = (getattr(entry, "content_path", None) for entry in site.route_list.values())
+    return [path for path in base_paths if path is not None]
 
 
 def get_site(import_path: str, site: str) -> Site:
@@ -31,10 +31,12 @@ def get_site(import_path: str, site: str) -> Site:
     return getattr(sys.modules[import_path], site)
 
 
-def remove_output_folder(output_path: Path) -> None:
-    """Remove the output folder"""
+def remove_output_folder(output_path: Path, cache_file: Path | None = None) -> None:
+    """Remove the output folder and the render cache file that records what was written to it"""
     if output_path.exists():
         shutil.rmtree(output_path)
+    if cache_file is not None:
+        cache_file.unlink(missing_ok=True)
 
 
 def split_module_site(module_site: str) -> tuple[str, str]:
@@ -193,7 +195,7 @@ def build(
     module, site = module_site
     site = get_site(module, site)
     if clean:
-        remove_output_folder(Path(site.output_path))
+        remove_output_folder(Path(site.output_path), site.cache_file)
     site.render()
 
 
@@ -259,7 +261,7 @@ def serve(
     site = get_site(module, site)
 
     if clean:
-        remove_output_folder(Path(site.output_path))
+        remove_output_folder(Path(site.output_path), site.cache_file)
     site.render()
 
     directory = str(site.output_path)
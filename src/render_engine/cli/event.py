@@ -2,11 +2,12 @@ import importlib
 import threading
 import time
 from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
 
 import watchfiles
 from rich.console import Console
 
-from render_engine import Site
+from render_engine import Collection, Site
 
 console = Console()
 
@@ -57,7 +58,7 @@ class ServerEventHandler:
         dir_to_serve: str,
         import_path: str,
         site: Site,
-        dirs_to_watch: str | None = None,
+        dirs_to_watch: list[Path | str] | None = None,
         patterns: list[str] | None = None,
         ignore_patterns: list[str] | None = None,
         *args,
@@ -90,6 +91,11 @@ class ServerEventHandler:
         console.print("[bold purple]Reloading and Rebuilding site...[/bold purple]")
         module = importlib.import_module(self.import_path)
         importlib.reload(module)
+
+        for entry in self.site.route_list.values():
+            if isinstance(entry, Collection):
+                entry.invalidate_pages()
+
         self.site.render()
 
     def stop_watcher(self) -> bool:
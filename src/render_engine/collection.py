@@ -1,18 +1,27 @@
+import fnmatch
 import logging
+import os
+import re
 from collections.abc import Callable, Generator
+from functools import cached_property
 from pathlib import Path
 from typing import Any
 
 import git
-from more_itertools import batched, flatten
+from more_itertools import batched
 from render_engine_parser import BasePageParser
-from slugify import slugify
 
 from ._base_object import BaseObject
 from .archive import Archive
 from .feeds import RSSFeed
 from .page import Page
 from .plugins import PluginManager
+from .utils import cached_slugify
+
+
+def _has_path_part(pattern: str) -> bool:
+    """Checks if a glob pattern matches more than the names in a single directory."""
+    return "**" in pattern or "/" in pattern or os.sep in pattern
 
 
 class Collection(BaseObject):
@@ -59,7 +68,10 @@ class Collection(BaseObject):
 
         iter_content_path(): Iterates through the collection's content path.
         get_page(content_path: str | Path | None = None): Returns the page Object for the specified Content Path.
-        sorted_pages: Returns the sorted pages of the collection.
+        pages: Returns the pages generated from the content path. These are generated once and cached.
+        invalidate_pages(): Clears the cached pages so they are regenerated on the next access.
+        pages_by_reference: Returns the pages keyed by their reference. This is built once and cached.
+        sorted_pages: Returns the sorted pages of the collection. These are sorted once and cached.
         archives: Returns the Archive objects containing the pages from the content path.
         feed: Returns the Feed object for the collection.
         slug: Returns the slugified title of the collection.
@@ -82,6 +94,7 @@ class Collection(BaseObject):
     template_vars: dict[str, Any]
     template: str | None
     plugin_manager: PluginManager | None
+    _prefetched_content_paths: list[Path]
 
     def __init__(
         self,
@@ -100,9 +113,33 @@ class Collection(BaseObject):
         self.title = self._title
         self.template_vars = getattr(self, "template_vars", {})
 
-    def iter_content_path(self):
-        """Iterate through in the collection's content path."""
-        return flatten([Path(self.content_path).glob(suffix) for suffix in self.include_suffixes])
+    def iter_content_path(self) -> Generator[Path, None, None]:
+        """
+        Iterate through in the collection's content path.
+
+        Suffixes that only match file names are checked in a single scan of the directory
+        against one pattern compiled from all of them.
+        Suffixes with a path part (like `**/*.md`) fall back to `pathlib.Path.glob`.
+        Both yield `pathlib.Path` objects.
+        """
+        name_suffixes = [suffix for suffix in self.include_suffixes if not _has_path_part(suffix)]
+        path_suffixes = [suffix for suffix in self.include_suffixes if _has_path_part(suffix)]
+
+        if name_suffixes:
+            is_included = re.compile(
+                "|".join(fnmatch.translate(os.path.normcase(suffix)) for suffix in name_suffixes)
+            ).match
+
+            try:
+                with os.scandir(self.content_path) as entries:
+                    for entry in entries:
+                        if is_included(os.path.normcase(entry.name)) and entry.is_file():
+                            yield Path(entry.path)
+            except (FileNotFoundError, NotADirectoryError):
+                pass
+
+        for suffix in path_suffixes:
+            yield from Path(self.content_path).glob(suffix)
 
     def _generate_content_from_modified_pages(
         self,
@@ -129,6 +166,10 @@ class Collection(BaseObject):
         content_path: str | Path | None = None,
     ) -> Page:
         """Returns the page Object for the specified Content Path"""
+        return self._get_page(content_path, self.to_dict())
+
+    def _get_page(self, content_path: str | Path | None, collection_context: dict) -> Page:
+        """Builds the page for the content path with its own copy of `collection_context`."""
         _page = self.content_type(
             content_path=content_path,
             Parser=self.Parser,
@@ -139,13 +180,60 @@ class Collection(BaseObject):
         _page.parser_extras = getattr(self, "parser_extras", {})
         _page.routes = self.routes
         _page.template = getattr(self, "template", None)
-        _page.collection = self.to_dict()
+        _page.collection = dict(collection_context)
         return _page
 
-    @property
+    @cached_property
+    def pages(self) -> list[Page]:
+        """
+        Returns the Page objects generated from the `content_path`.
+
+        The content path is only read the first time this is accessed.
+        Use [`invalidate_pages`][src.render_engine.collection.Collection.invalidate_pages]
+        to regenerate the pages after the content has changed.
+
+        Setting `pages` on the collection class overrides this.
+        """
+        # Use the content paths listed ahead of time by `Site.render` when there are any
+        content_paths = self.__dict__.pop("_prefetched_content_paths", None)
+        if content_paths is None:
+            content_paths = self.iter_content_path()
+
+        if type(self).get_page is not Collection.get_page:
+            return [self.get_page(content_path) for content_path in content_paths]
+
+        # The collection doesn't change while its pages are generated so `to_dict` is only called once
+        collection_context = self.to_dict()
+        return [self._get_page(content_path, collection_context) for content_path in content_paths]
+
+    def invalidate_pages(self) -> None:
+        """Clears the cached pages so they are regenerated from the `content_path` on the next access."""
+        for cached_attr in ("pages", "sorted_pages", "pages_by_reference"):
+            self.__dict__.pop(cached_attr, None)
+
+    @cached_property
+    def pages_by_reference(self) -> dict[str, Page]:
+        """
+        Returns the pages keyed by their reference attribute (the `slug` by default).
+
+        This is built once so looking up a page in the collection doesn't scan every page.
+        If pages share a reference, the first page is used.
+        """
+        index: dict[str, Page] = {}
+
+        for page in self:
+            index.setdefault(getattr(page, page._reference), page)
+        return index
+
+    @cached_property
     def sorted_pages(self):
+        """
+        Returns the pages sorted by `sort_by`.
+
+        The pages are sorted once and reused for every archive and `url_for` lookup.
+        """
         return sorted(
-            (page for page in self.__iter__()),
+            self,
             key=lambda page: getattr(page, self.sort_by, self._title),
             reverse=self.sort_reverse,
         )
@@ -166,12 +254,12 @@ class Collection(BaseObject):
             )
             yield from ()
 
-        sorted_pages = list(self.sorted_pages)
+        sorted_pages = self.sorted_pages
         items_per_page = getattr(self, "items_per_page", len(sorted_pages))
         archives = [sorted_pages]
 
         if items_per_page != len(sorted_pages):
-            archives.extend(list(batched(sorted_pages, items_per_page)))
+            archives.extend(batched(sorted_pages, items_per_page))
             self.template_vars["num_of_pages"] = len(archives) - 1 / items_per_page
         else:
             self.template_vars["num_of_pages"] = 1
@@ -199,7 +287,7 @@ class Collection(BaseObject):
 
     @property
     def slug(self):
-        return slugify(self.title)
+        return cached_slugify(self.title)
 
     def __repr__(self):
         return f"{self}: {__class__.__name__}"
@@ -208,12 +296,7 @@ class Collection(BaseObject):
         return f"{__class__.__name__}"
 
     def __iter__(self):
-        if not hasattr(self, "pages"):
-            for page in self.iter_content_path():
-                yield self.get_page(page)
-        else:
-            for page in self.pages:
-                yield page
+        yield from self.pages
 
 
 def render_archives(archive, **kwargs) -> list[Archive]:
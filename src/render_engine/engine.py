@@ -11,6 +11,7 @@ from jinja2 import (
     pass_environment,
     select_autoescape,
 )
+from more_itertools import nth
 
 from .collection import Collection
 
@@ -27,11 +28,16 @@ render_engine_templates_loader = ChoiceLoader(
     ]
 )
 
+# Templates are compiled once per render.
+# `auto_reload` is off so loading a cached template doesn't check the template source for changes.
+# `Site.render` clears the cache at the start of each render to pick up template changes.
 engine = Environment(
     loader=render_engine_templates_loader,
     autoescape=select_autoescape(["xml"]),
     lstrip_blocks=True,
     trim_blocks=True,
+    auto_reload=False,
+    cache_size=-1,
 )
 
 
@@ -85,15 +91,24 @@ def url_for(env: Environment, value: str, page: int = 0) -> str:
     if len(route) == 2 and isinstance(route, list):
         collection, route = route
         if collection := routes.get(collection, None):
-            for page in collection:
-                if getattr(page, page._reference) == route:
-                    return page.url_for()
+            if page := collection.pages_by_reference.get(route):
+                return page.url_for()
 
     else:
         route = routes.get(value)
-        if isinstance(route, Collection):
-            return list(route.archives)[page].url_for()
-        return route.url_for()
+        if not isinstance(route, Collection):
+            return route.url_for()
+
+        if page < 0:
+            # Negative pages count back from the last archive, so every archive is needed
+            archives = list(route.archives)
+            archive = archives[page] if -page <= len(archives) else None
+        else:
+            # Only build the archives up to the one requested
+            archive = nth(route.archives, page)
+
+        if archive:
+            return archive.url_for()
 
     raise ValueError(f"{value} is not a valid route.")
 
@@ -1,6 +1,14 @@
+import contextlib
 import copy
+import hashlib
+import inspect
 import logging
-from collections import defaultdict
+import os
+import shutil
+from collections import defaultdict, deque
+from collections.abc import Generator
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import cached_property
 from pathlib import Path
 
 from jinja2 import FileSystemLoader, PrefixLoader
@@ -12,6 +20,76 @@ from .engine import engine
 from .page import Page
 from .plugins import PluginManager
 from .themes import Theme, ThemeManager
+from .utils import cached_slugify
+
+DIGEST_SIZE = 16
+MTIME_SIZE = 8
+# the cache file starts with a magic number and format version, bump the version when the entries change
+CACHE_HEADER = b"RECH\x02"
+# render caches are kept together in one directory that ignores itself in git
+CACHE_DIR = Path(".render-engine")
+WRITE_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+# rendered content is held in memory until it is written, so only a few writes per worker are queued
+MAX_PENDING_WRITES = 2 * WRITE_WORKERS
+
+
+def hash_content(content: bytes) -> bytes:
+    """Returns the digest used to check if rendered content has changed since it was last written."""
+    return hashlib.blake2b(content, digest_size=DIGEST_SIZE).digest()
+
+
+def copy_output(source: Path, path: Path) -> None:
+    """
+    Copies `source` to `path` inside the kernel using `os.copy_file_range` where it is available.
+
+    Falls back to `shutil.copyfile` (which uses `os.sendfile` on Linux) when the file system doesn't support it.
+    File systems that stop copying before the end of the file are copied again with `shutil.copyfileobj`.
+    """
+    if not hasattr(os, "copy_file_range"):
+        shutil.copyfile(source, path)
+        return
+
+    with open(source, "rb") as src, open(path, "wb") as dst:
+        remaining = os.fstat(src.fileno()).st_size
+
+        # a failed or short copy leaves `remaining` above zero
+        with contextlib.suppress(OSError):
+            while remaining > 0 and (copied := os.copy_file_range(src.fileno(), dst.fileno(), remaining)):
+                remaining -= copied
+
+        if remaining > 0:
+            src.seek(0)
+            dst.seek(0)
+            dst.truncate()
+            shutil.copyfileobj(src, dst)
+
+
+def write_output(paths: list[Path], content: bytes) -> int:
+    """
+    Writes `content` to the first path and hard links the remaining paths to it.
+
+    Existing files are removed first so outputs that were linked by an earlier render are never changed together.
+    If a link can't be created, the first path is copied instead.
+    """
+    source, *links = paths
+    source.unlink(missing_ok=True)
+    written = source.write_bytes(content)
+
+    for path in links:
+        if path == source:
+            continue
+        path.unlink(missing_ok=True)
+        try:
+            os.link(source, path)
+        except OSError:
+            copy_output(source, path)
+
+    return written
+
+
+def has_pending_pages(collection: Collection) -> bool:
+    """Checks if the collection's pages will be generated from its `content_path` the next time they are used."""
+    return isinstance(inspect.getattr_static(collection, "pages"), cached_property)
 
 
 class Site:
@@ -22,6 +100,10 @@ class Site:
         partial (bool): Indicates whether the site is a partial site or not.
         site_vars (dict): A dictionary containing site-wide variables and their values.
         plugin_settings (dict): A dictionary containing plugin settings.
+        hashes (dict): A mapping of output path digests to the digest of their content and the modification time
+            of the file, recorded during the render.
+            Pages whose rendered content has not changed since the last render are not written again.
+            This is saved to `cache_file` after each render.
 
     Methods:
         update_site_vars(**kwargs): Updates the site-wide variables with the given key-value pairs.
@@ -36,6 +118,8 @@ class Site:
 
     Properties:
         output_path: The output path where the rendered files will be saved.
+        cache_file: The file where `hashes` are saved between renders. This is kept outside of the output path,
+            in a file named after the output path in the `.render-engine` directory unless `_cache_file_name` is set.
         static_paths: The paths to static files used in the site.
         template_path: The path to the template files used for rendering.
     """
@@ -51,6 +135,7 @@ class Site:
     _output_path: str | Path = "output"
     _template_path: str | Path = "templates"
     _static_paths: set = {"static"}
+    _cache_file_name: str | Path | None = None
     plugin_settings: dict = {"plugins": defaultdict(dict)}
 
     def __init__(
@@ -65,6 +150,13 @@ class Site:
         self.route_list: dict = {}
         self.site_settings: dict = {}
         self.subcollections: dict[str, list] = {"pages": []}
+        self.hashes: dict[bytes, bytes] = {}
+        self._baseline_hashes: dict[bytes, bytes] = {}
+        self._dropped_hashes: set[bytes] = set()
+        self._created_dirs: set[Path] = set()
+        self._write_executor: ThreadPoolExecutor | None = None
+        self._pending_writes: dict[Path, Future] = {}
+        self._queued_writes: deque[Future] = deque()
         self.theme_manager.engine.globals.update(self.site_vars)
         if self.theme_manager.engine.loader is not None:
             self.theme_manager.engine.loader.loaders.insert(0, FileSystemLoader(self._template_path))
@@ -77,6 +169,13 @@ class Site:
     def output_path(self, output_path: Path | str) -> None:
         self.theme_manager.output_path = output_path
 
+    @property
+    def cache_file(self) -> Path:
+        if self._cache_file_name is not None:
+            return Path(self._cache_file_name)
+        # each output path gets its own cache file so sites sharing a working directory keep their own hashes
+        return CACHE_DIR / f"cache-{cached_slugify(str(self.output_path))}"
+
     @property
     def static_paths(self) -> set:
         return self.theme_manager.static_paths
@@ -202,8 +301,12 @@ class Site:
 
     def _render_output(self, route: str | Path, page: Page | Archive) -> int:
         """writes the page object to disk"""
+        return self._render_routes(page, [route])
+
+    def _render_page(self, route: str | Path, page: Page | Archive) -> tuple[Path, bytes]:
+        """renders the page object for the route and returns the output path with the encoded content"""
         path = Path(self.output_path) / Path(route) / Path(page.path_name)
-        path.parent.mkdir(parents=True, exist_ok=True)
+        self._ensure_dir(path.parent)
         settings = {**self.site_settings.get("plugins", {}), **{"route": route}}
 
         if hasattr(page, "plugin_manager") and page.plugin_manager is not None:
@@ -214,13 +317,201 @@ class Site:
         if hasattr(page, "plugin_manager") and page.plugin_manager is not None:
             page.plugin_manager._pm.hook.post_render_content(page=page.__class__, settings=settings, site=self)
 
-        return path.write_text(page.rendered_content)
+        # encode once so the same bytes are hashed and written
+        return path, page.rendered_content.encode("utf-8")
+
+    def _render_routes(self, page: Page | Archive, routes: list[str | Path]) -> int:
+        """
+        writes the page object to disk for each of the routes.
+
+        When a route renders the same content as the previous route, its output is
+        hard linked to the previous output instead of being written again.
+        """
+        outputs: list[tuple[bytes, list[Path]]] = []
+
+        for route in routes:
+            path, content = self._render_page(route, page)
+
+            # another page can render to the same path (e.g. pages with the same slug), so its write has to finish first
+            if (pending_write := self._pending_writes.pop(path, None)) is not None:
+                pending_write.result()
+
+            # routes like "./" and "." render to the same path, only the last content rendered to it is written
+            for _, paths in outputs:
+                if path in paths:
+                    paths.remove(path)
+            outputs = [(output, paths) for output, paths in outputs if paths]
+
+            if not self._is_unique(path, content):
+                logging.debug("Skipping unchanged output: %s", path)
+            elif outputs and outputs[-1][0] == content:
+                outputs[-1][1].append(path)
+            else:
+                outputs.append((content, [path]))
+
+        if self._write_executor is None:
+            return sum(write_output(paths, content) for content, paths in outputs)
+
+        for content, paths in outputs:
+            # wait for the oldest writes when rendering gets ahead of the disk
+            while len(self._queued_writes) >= MAX_PENDING_WRITES:
+                self._queued_writes.popleft().result()
+
+            write = self._write_executor.submit(write_output, paths, content)
+            self._queued_writes.append(write)
+            self._pending_writes.update(dict.fromkeys(paths, write))
+        return sum(len(content) for content, _ in outputs)
+
+    def _ensure_dir(self, path: Path) -> None:
+        """Creates the directory, skipping directories that were already created during the render."""
+        if path not in self._created_dirs:
+            path.mkdir(parents=True, exist_ok=True)
+            self._created_dirs.add(path)
+
+    def _is_unique(self, path: Path, content: bytes) -> bool:
+        """
+        Checks if `content` still needs to be written to `path` and records its hash for the next render.
+
+        The content is only hashed when `path` already exists with the same size.
+        The saved hash includes the modification time of the file, so files changed outside of the render are
+        written again. Paths without a saved hash, or that were already rendered during this render,
+        are compared to the existing file instead.
+
+        Only unchanged files are recorded, the modification time of a rewritten file is known on the next render.
+        """
+        key = hash_content(str(path).encode("utf-8"))
+
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            stat = None
+
+        if stat is None or stat.st_size != len(content):
+            self._dropped_hashes.add(key)
+            self.hashes.pop(key, None)
+            return True
+
+        record = hash_content(content) + stat.st_mtime_ns.to_bytes(MTIME_SIZE, "big", signed=True)
+
+        # the hashes from the last render are only read from, hashes for this render are kept separately.
+        # A path that was already rendered during this render may have been rewritten after its hash was saved.
+        rendered = key in self.hashes or key in self._dropped_hashes
+        if not rendered and (saved_record := self._baseline_hashes.get(key)) is not None:
+            unique = saved_record != record
+        else:
+            unique = path.read_bytes() != content
+
+        if unique:
+            self._dropped_hashes.add(key)
+            self.hashes.pop(key, None)
+        else:
+            self.hashes[key] = record
+        return unique
+
+    def _load_hashes(self) -> dict[bytes, bytes]:
+        """
+        Reads the hashes saved by the last render from `cache_file`.
+
+        The file starts with `CACHE_HEADER`. Each entry is the digest of an output path followed by the digest of
+        its content and its modification time.
+        A missing, unreadable or malformed cache file, or one written in another format version, is ignored.
+        """
+        try:
+            data = self.cache_file.read_bytes()
+        except FileNotFoundError:
+            return {}
+        except OSError as e:
+            logging.warning("Ignoring unreadable cache file: %s (%s)", self.cache_file, e)
+            return {}
+
+        if not data.startswith(CACHE_HEADER):
+            logging.warning("Ignoring cache file from another version: %s", self.cache_file)
+            return {}
+
+        entry_size = 2 * DIGEST_SIZE + MTIME_SIZE
+        if (len(data) - len(CACHE_HEADER)) % entry_size:
+            logging.warning("Ignoring malformed cache file: %s", self.cache_file)
+            return {}
+
+        return {
+            data[i : i + DIGEST_SIZE]: data[i + DIGEST_SIZE : i + entry_size]
+            for i in range(len(CACHE_HEADER), len(data), entry_size)
+        }
+
+    def _save_hashes(self) -> None:
+        """
+        Writes `hashes` to `cache_file` so unchanged pages are skipped in the next render.
+
+        Only the hashes recorded during the render are saved, so outputs that are no longer rendered are dropped.
+        Partial renders keep the hashes of the pages they didn't render.
+
+        The file is only written when the hashes changed during the render.
+        Entries are sorted so the same hashes always produce the same file.
+        The cache is only an optimisation, so a cache file that can't be written is skipped with a warning.
+        """
+        hashes = self.hashes
+
+        if self.partial:
+            hashes = {
+                key: record for key, record in self._baseline_hashes.items() if key not in self._dropped_hashes
+            } | self.hashes
+
+        if hashes == self._baseline_hashes:
+            return
+
+        try:
+            self._ensure_dir(self.cache_file.parent)
+            if self.cache_file.parent == CACHE_DIR and not (gitignore := CACHE_DIR / ".gitignore").exists():
+                gitignore.write_text("*\n")
+            self.cache_file.write_bytes(CACHE_HEADER + b"".join(sorted(key + record for key, record in hashes.items())))
+        except OSError as e:
+            logging.warning("Unable to write cache file: %s (%s)", self.cache_file, e)
+
+    @contextlib.contextmanager
+    def _background_writes(self) -> Generator[None, None, None]:
+        """
+        Hands the file writes from `_render_routes` to a thread pool while the block is running.
+
+        Pages are still rendered one at a time, but writing them to disk overlaps with rendering the next page.
+        Writes to a path that is rendered again wait until the earlier write is finished,
+        so the last page rendered to a path is the one left on disk.
+        At most `MAX_PENDING_WRITES` writes are queued, rendering waits for the oldest write once the limit is reached.
+        All writes are finished (and any errors raised) before the block exits.
+        """
+        with ThreadPoolExecutor(max_workers=WRITE_WORKERS) as executor:
+            self._write_executor = executor
+            try:
+                yield
+                for future in self._queued_writes:
+                    future.result()
+            finally:
+                self._write_executor = None
+                self._pending_writes = {}
+                self._queued_writes = deque()
+
+    def _prefetch_content_paths(self, executor: ThreadPoolExecutor) -> dict[str, Future]:
+        """
+        Starts listing the content paths of the collections in the background.
+
+        The next collections are listed while the current one is rendered,
+        which hides the time spent listing directories on slow (e.g. network) file systems.
+        Collections that already have their pages are skipped.
+
+        Only the default `iter_content_path` is run in the background,
+        custom ones can depend on resources that are bound to the main thread.
+        """
+        return {
+            slug: executor.submit(list, entry.iter_content_path())
+            for slug, entry in self.route_list.items()
+            if isinstance(entry, Collection)
+            and has_pending_pages(entry)
+            and type(entry).iter_content_path is Collection.iter_content_path
+        }
 
     def _render_partial_collection(self, collection: Collection) -> None:
         """Iterate through the Changed Pages and Check for Collections and Feeds"""
         for entry in collection._generate_content_from_modified_pages():
-            for route in collection.routes:
-                self._render_output(route, entry)
+            self._render_routes(entry, collection.routes)
 
         if getattr(collection, "has_archive", False):
             for archive in collection.archives:
@@ -240,15 +531,12 @@ class Site:
         for entry in collection:
             entry._pm = copy.deepcopy(self.plugin_manager._pm)
 
-            for route in collection.routes:
-                self._render_output(route, entry)
+            self._render_routes(entry, collection.routes)
 
         if getattr(collection, "has_archive", False):
             for archive in collection.archives:
                 logging.debug("Adding Archive: %s", archive.__class__.__name__)
-
-                for route in collection.routes:
-                    self._render_output(collection.routes[0], archive)
+                self._render_output(collection.routes[0], archive)
 
                 if archive.is_index:
                     archive.slug = "index"
@@ -302,6 +590,10 @@ class Site:
 
             self.load_themes()
             self.theme_manager.engine.globals.update(self.site_vars)
+
+            # templates are not checked for changes once loaded, so each render starts with a fresh cache
+            if self.theme_manager.engine.cache is not None:
+                self.theme_manager.engine.cache.clear()
             # Parse Route List
             task_add_route = progress.add_task("[blue]Adding Routes", total=len(self.route_list))
 
@@ -310,22 +602,30 @@ class Site:
             self.theme_manager.engine.globals["site"] = self
             self.theme_manager.engine.globals["routes"] = self.route_list
 
-            for slug, entry in self.route_list.items():
-                progress.update(task_add_route, description=f"[blue]Adding[gold]Route: [blue]{slug}")
-                if isinstance(entry, Page):
-                    for route in entry.routes:
-                        progress.update(
-                            task_add_route,
-                            description=f"[blue]Adding[gold]Route: [blue]{entry._slug}",
-                        )
-                        self._render_output(route, entry)
-
-                if isinstance(entry, Collection):
-                    if not self.partial:
-                        self._render_full_collection(entry)
-                    else:
-                        self._render_partial_collection(entry)
+            self._baseline_hashes = self._load_hashes()
+            self.hashes = {}
+            self._dropped_hashes = set()
+            self._created_dirs = set()
+
+            with self._background_writes(), ThreadPoolExecutor(max_workers=1) as prefetch_executor:
+                prefetched = {} if self.partial else self._prefetch_content_paths(prefetch_executor)
+
+                for slug, entry in self.route_list.items():
+                    progress.update(task_add_route, description=f"[blue]Adding[gold]Route: [blue]{slug}")
+                    if isinstance(entry, Page):
+                        self._render_routes(entry, entry.routes)
+
+                    if isinstance(entry, Collection):
+                        if not self.partial:
+                            if (content_paths := prefetched.get(slug)) and has_pending_pages(entry):
+                                entry._prefetched_content_paths = content_paths.result()
+                            self._render_full_collection(entry)
+                        else:
+                            self._render_partial_collection(entry)
+
+                    progress.advance(task_add_route)
 
+            self._save_hashes()
             progress.add_task("Loading Post-Build Plugins", total=1)
             self.plugin_manager._pm.hook.post_build_site(
                 site=self,
@@ -1,5 +1,7 @@
 import dataclasses
+import hashlib
 import logging
+import os
 import pathlib
 import shutil
 from pathlib import Path
@@ -8,6 +10,37 @@ import slugify
 from jinja2 import BaseLoader, Environment
 
 
+def _static_fingerprint(static_path: str | pathlib.Path) -> bytes:
+    """
+    Returns a digest of the relative path, size, and modification time of every file in the static path.
+
+    Symlinked directories are followed, like `shutil.copytree` does when copying them.
+    """
+    fingerprint = hashlib.blake2b(digest_size=16)
+
+    for dirpath, dirnames, filenames in os.walk(static_path, followlinks=True):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            file_path = os.path.join(dirpath, filename)
+            relative_path = os.path.relpath(file_path, static_path)
+            stat = os.stat(file_path)
+            fingerprint.update(f"{relative_path}|{stat.st_size}|{stat.st_mtime_ns}\n".encode())
+    return fingerprint.digest()
+
+
+def _copy_if_changed(src: str, dst: str) -> str:
+    """Copies `src` to `dst` unless `dst` already has the same size and modification time."""
+    try:
+        dst_stat = os.stat(dst)
+    except FileNotFoundError:
+        return shutil.copy2(src, dst)
+
+    src_stat = os.stat(src)
+    if (src_stat.st_size, src_stat.st_mtime_ns) != (dst_stat.st_size, dst_stat.st_mtime_ns):
+        return shutil.copy2(src, dst)
+    return dst
+
+
 @dataclasses.dataclass
 class Theme:
     """
@@ -76,6 +109,7 @@ class ThemeManager:
     prefix: dict[str, BaseLoader] = dataclasses.field(default_factory=dict)
     static_paths: set = dataclasses.field(default_factory=set)
     template_globals: dict[str, set] = dataclasses.field(default_factory=default_template_globals)
+    _static_fingerprints: dict[pathlib.Path, bytes] = dataclasses.field(default_factory=dict, init=False, repr=False)
 
     def register_theme(self, theme: Theme):
         """
@@ -102,12 +136,30 @@ class ThemeManager:
                     self.engine.globals[key] = value
 
     def _render_static(self) -> None:
-        """Copies a Static Directory to the output folder"""
+        """
+        Copies a Static Directory to the output folder
+
+        Static directories are skipped when neither they nor their copy in the output folder changed since they were
+        last copied, so files removed or edited in the output folder are restored.
+        Otherwise only the files with a different size or modification time are copied.
+        """
         for static_path in self.static_paths:
             logging.debug(f"Copying Static Files from {static_path}")
             if pathlib.Path(static_path).exists():
+                output_static_path = pathlib.Path(self.output_path) / pathlib.Path(static_path).name
+                fingerprint = _static_fingerprint(static_path)
+                output_fingerprint = _static_fingerprint(output_static_path) if output_static_path.exists() else None
+
+                if output_fingerprint is not None and self._static_fingerprints.get(output_static_path) == (
+                    fingerprint + output_fingerprint
+                ):
+                    logging.debug(f"Static Files unchanged in {static_path}")
+                    continue
+
                 shutil.copytree(
                     static_path,
-                    pathlib.Path(self.output_path) / pathlib.Path(static_path).name,
+                    output_static_path,
                     dirs_exist_ok=True,
+                    copy_function=_copy_if_changed,
                 )
+                self._static_fingerprints[output_static_path] = fingerprint + _static_fingerprint(output_static_path)
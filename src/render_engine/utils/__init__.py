@@ -0,0 +1,13 @@
+import functools
+
+from slugify import slugify
+
+
+@functools.cache
+def cached_slugify(text: str) -> str:
+    """
+    Returns the slugified `text`.
+
+    Slugs are requested several times for every page that is rendered, so the results are memoized.
+    """
+    return slugify(text)
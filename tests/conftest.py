@@ -25,6 +25,12 @@ def engine() -> Environment:
     return env
 
 
+@pytest.fixture(autouse=True)
+def cache_file(tmp_path, monkeypatch):
+    """Keeps the render cache of each test out of the working directory"""
+    monkeypatch.setattr(Site, "_cache_file_name", tmp_path / ".render-engine-cache")
+
+
 @pytest.fixture()
 def site(tmp_path):
     tmp_dir = tmp_path / "content"
@@ -50,6 +50,155 @@ def test_pages_generate_from_collection_content_path(tmp_path: pathlib.Path):
         assert page.content in content
 
 
+def test_iter_content_path_only_yields_included_files(tmp_path: pathlib.Path):
+    """
+    Tests that only files matching `include_suffixes` are yielded from the content path
+    """
+
+    dir = tmp_path / "content"
+    dir.mkdir()
+    dir.joinpath("page.md").write_text("page")
+    dir.joinpath("page.html").write_text("page")
+    dir.joinpath("image.png").write_text("image")
+    dir.joinpath("nested.md").mkdir()
+
+    class BasicCollection(Collection):
+        content_path = dir
+
+    collection = BasicCollection()
+    assert sorted(pathlib.Path(path).name for path in collection.iter_content_path()) == ["page.html", "page.md"]
+
+
+def test_iter_content_path_matches_glob_patterns(tmp_path: pathlib.Path):
+    """
+    Tests that `include_suffixes` are treated as glob patterns and not only as suffixes
+    """
+
+    dir = tmp_path / "content"
+    dir.mkdir()
+    dir.joinpath("post-1.md").write_text("post")
+    dir.joinpath("draft-1.md").write_text("draft")
+
+    class BasicCollection(Collection):
+        content_path = dir
+        include_suffixes = ["post-*.md"]
+
+    collection = BasicCollection()
+    assert [pathlib.Path(path).name for path in collection.iter_content_path()] == ["post-1.md"]
+
+
+def test_iter_content_path_matches_recursive_glob_patterns(tmp_path: pathlib.Path):
+    """
+    Tests that `include_suffixes` with a path part match files in the subdirectories of the content path
+    """
+
+    dir = tmp_path / "content"
+    dir.joinpath("sub").mkdir(parents=True)
+    dir.joinpath("a.md").write_text("a")
+    dir.joinpath("sub", "b.md").write_text("b")
+
+    class BasicCollection(Collection):
+        content_path = dir
+        include_suffixes = ["**/*.md"]
+
+    collection = BasicCollection()
+    assert sorted(pathlib.Path(path).relative_to(dir) for path in collection.iter_content_path()) == [
+        pathlib.Path("a.md"),
+        pathlib.Path("sub", "b.md"),
+    ]
+
+
+@pytest.mark.parametrize("include_suffixes", [["*.md"], ["**/*.md"]])
+def test_iter_content_path_yields_paths(tmp_path: pathlib.Path, include_suffixes: list[str]):
+    """
+    Tests that `iter_content_path` yields `pathlib.Path` objects for patterns with and without a path part
+    """
+
+    dir = tmp_path / "content"
+    dir.mkdir()
+    dir.joinpath("page.md").write_text("page")
+
+    class BasicCollection(Collection):
+        content_path = dir
+
+    BasicCollection.include_suffixes = include_suffixes
+    content_paths = list(BasicCollection().iter_content_path())
+
+    assert content_paths == [dir / "page.md"]
+    assert all(isinstance(path, pathlib.Path) for path in content_paths)
+
+
+def test_collection_pages_are_cached_until_invalidated(tmp_path: pathlib.Path):
+    """
+    Tests that pages are only generated once from the content path until `invalidate_pages` is called
+    """
+
+    dir = tmp_path / "content"
+    dir.mkdir()
+    dir.joinpath("test0.md").write_text("foo")
+
+    class BasicCollection(Collection):
+        content_path = dir
+
+    collection = BasicCollection()
+    pages = collection.pages
+    assert len(collection.sorted_pages) == 1
+    dir.joinpath("test1.md").write_text("bar")
+
+    assert collection.pages is pages
+    assert len(list(collection)) == 1
+
+    collection.invalidate_pages()
+    assert len(list(collection)) == 2
+    assert len(collection.sorted_pages) == 2
+
+
+def test_collection_pages_share_collection_context(tmp_path: pathlib.Path, mocker):
+    """
+    Tests that the `collection` context is generated once for all of the pages in the content path
+    and that each page gets its own copy of it
+    """
+
+    dir = tmp_path / "content"
+    dir.mkdir()
+    dir.joinpath("test0.md").write_text("foo")
+    dir.joinpath("test1.md").write_text("bar")
+
+    class BasicCollection(Collection):
+        content_path = dir
+
+    collection = BasicCollection()
+    to_dict = mocker.spy(collection, "to_dict")
+    first, second = collection.pages
+
+    assert to_dict.call_count == 1
+    assert first.collection == second.collection
+    assert first.collection["title"] == collection._title
+
+    first.collection["title"] = "changed"
+    assert second.collection["title"] == collection._title
+
+
+def test_collection_pages_by_reference():
+    """
+    Tests that pages can be looked up by their reference
+    """
+
+    class CustomPage1(Page):
+        pass
+
+    class CustomPage2(Page):
+        pass
+
+    class BasicCollection(Collection):
+        pages = [CustomPage1(), CustomPage2()]
+
+    collection = BasicCollection()
+
+    assert collection.pages_by_reference["custompage2"] is collection.pages[1]
+    assert "custompage3" not in collection.pages_by_reference
+
+
 def test_collection_archive_no_items_per_page(caplog, tmp_path: pathlib.Path):
     """
     Tests that archive generates a single page if items_per_page is not set
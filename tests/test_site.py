@@ -1,9 +1,14 @@
+import os
+import shutil
+import threading
+import time
 from pathlib import Path
 
 import pluggy
 import pytest
 from jinja2 import DictLoader, FileSystemLoader
 
+import render_engine.site as site_module
 from render_engine.collection import Collection
 from render_engine.page import Page
 from render_engine.plugins import SiteSpecs
@@ -116,6 +121,23 @@ def test_url_for_Page_in_site(site, tmp_path: Path):
     assert custom_page.read_text() == "The URL is '/custompage.html'"
 
 
+def test_site_render_picks_up_changed_templates(site, tmp_path: Path):
+    """Tests that a template changed after a render is used by the next render"""
+    test_template = Path(tmp_path / "changed_template.html")
+    test_template.write_text("before")
+    site.theme_manager.engine.loader.loaders.insert(0, FileSystemLoader(tmp_path))
+
+    @site.page
+    class CustomPage(Page):
+        template = test_template.name
+
+    site.render()
+    test_template.write_text("after")
+    site.render()
+
+    assert (site.output_path / "custompage.html").read_text() == "after"
+
+
 def test_collection_archive_in_route_list(site, tmp_path: Path):
     """Given a collection with an archive, the archive should be in the route list and accessible with url_for"""
     test_collection_archive_template = Path(tmp_path / "archive_template.html")
@@ -145,6 +167,51 @@ def test_collection_archive_in_route_list(site, tmp_path: Path):
     )
 
 
+def test_collection_content_path_prefetched_during_render(site, tmp_path: Path, mocker):
+    """Tests that a collection's content path is listed on a background thread and used to generate its pages"""
+    content_dir = tmp_path / "content"
+    content_dir.mkdir()
+    content_dir.joinpath("test.md").write_text("this is a test")
+    scandir = os.scandir
+    listing_threads = []
+
+    def recording_scandir(path):
+        if path == content_dir:
+            listing_threads.append(threading.current_thread())
+        return scandir(path)
+
+    mocker.patch("render_engine.collection.os.scandir", side_effect=recording_scandir)
+
+    @site.collection
+    class CustomCollection(Collection):
+        content_path = content_dir
+
+    site.render()
+
+    assert len(listing_threads) == 1
+    assert listing_threads[0] is not threading.current_thread()
+    assert "_prefetched_content_paths" not in vars(site.route_list["customcollection"])
+    assert (site.output_path / "page.html").read_text() == "this is a test"
+
+
+def test_custom_collection_content_path_not_prefetched(site, tmp_path: Path):
+    """Tests that a custom `iter_content_path` is called on the rendering thread"""
+    content_file = tmp_path / "test.md"
+    content_file.write_text("this is a test")
+    listing_threads = []
+
+    @site.collection
+    class CustomCollection(Collection):
+        def iter_content_path(self):
+            listing_threads.append(threading.current_thread())
+            yield content_file
+
+    site.render()
+
+    assert listing_threads == [threading.current_thread()]
+    assert (site.output_path / "page.html").read_text() == "this is a test"
+
+
 @pytest.fixture(scope="module")
 def site_with_collection(tmp_path_factory: pytest.TempPathFactory):
     collection_archive_path = tmp_path_factory.getbasetemp() / "collection_archive_items"
@@ -217,6 +284,40 @@ def test_url_for_Collection_in_site(site: Site, tmp_path: Path):
     assert custom_page.read_text() == "The URL is '/customcollectionpage.html'"
 
 
+def test_url_for_Collection_archive_page_in_site(site: Site, tmp_path: Path):
+    """
+    Tests that url_for a collection archive page is added to a template
+    and that an archive page that doesn't exist raises an error
+    """
+    test_template = Path(tmp_path / "custom_archive_page_template.html")
+    test_template.write_text("The URL is '{{ 'customcollection' | url_for(page=1) }}'")
+    site.theme_manager.engine.loader.loaders.insert(0, FileSystemLoader(tmp_path))
+
+    class CustomCollectionPage1(Page):
+        template = test_template.name
+
+    class CustomCollectionPage2(Page):
+        template = test_template.name
+
+    @site.collection
+    class CustomCollection(Collection):
+        items_per_page = 1
+        pages = [CustomCollectionPage1(), CustomCollectionPage2()]
+
+    site.render()
+    custom_page = site.output_path / "customcollectionpage1.html"
+    assert custom_page.read_text() == "The URL is '/customcollection1.html'"
+
+    url_for = site.theme_manager.engine.filters["url_for"]
+    assert url_for(site.theme_manager.engine, "customcollection", page=-1) == "/customcollection2.html"
+
+    with pytest.raises(ValueError):
+        url_for(site.theme_manager.engine, "customcollection", page=5)
+
+    with pytest.raises(ValueError):
+        url_for(site.theme_manager.engine, "customcollection", page=-5)
+
+
 def test_site_output_path(site, tmp_path: Path):
     """Tests site outputs to output_path"""
 
@@ -229,6 +330,373 @@ def test_site_output_path(site, tmp_path: Path):
     assert (site.output_path / "custompage.html").exists()
 
 
+def test_site_page_with_multiple_routes_links_identical_output(site):
+    """Tests that a page rendering the same content for each route is written once and linked to the other routes"""
+
+    @site.page
+    class CustomPage(Page):
+        content = "this is a test"
+        routes = ["customroute", "customroute2"]
+
+    site.render()
+    first_route = site.output_path / "customroute" / "custompage.html"
+    second_route = site.output_path / "customroute2" / "custompage.html"
+
+    assert second_route.read_text() == "this is a test"
+    assert first_route.samefile(second_route)
+
+
+def test_site_page_with_multiple_routes_copies_output_when_links_fail(site, mocker):
+    """Tests that identical outputs are copied when they can't be hard linked"""
+    mocker.patch("render_engine.site.os.link", side_effect=OSError)
+
+    @site.page
+    class CustomPage(Page):
+        content = "this is a test"
+        routes = ["customroute", "customroute2"]
+
+    site.render()
+    first_route = site.output_path / "customroute" / "custompage.html"
+    second_route = site.output_path / "customroute2" / "custompage.html"
+
+    assert second_route.read_text() == "this is a test"
+    assert not first_route.samefile(second_route)
+
+
+@pytest.mark.parametrize("routes", [["./", "."], ["blog", "blog/"], ["blog", "news", "blog"]])
+def test_site_page_with_duplicate_routes_is_written_once(site, routes):
+    """Tests that routes resolving to the same output path don't break linking identical outputs"""
+
+    @site.page
+    class CustomPage(Page):
+        content = "this is a test"
+
+    site.route_list["custompage"].routes = routes
+
+    for _ in range(2):
+        site.render()
+        for route in routes:
+            assert (site.output_path / route / "custompage.html").read_text() == "this is a test"
+
+
+def test_site_last_page_rendered_to_a_path_is_written(site, mocker):
+    """Tests that a slow write to a path finishes before another page is written to the same path"""
+    write_output = site_module.write_output
+
+    def slow_write_output(paths, content):
+        if content == b"first":
+            time.sleep(0.1)
+        return write_output(paths, content)
+
+    mocker.patch("render_engine.site.write_output", side_effect=slow_write_output)
+
+    class FirstPage(Page):
+        slug = "custompage"
+        content = "first"
+
+    class SecondPage(Page):
+        slug = "custompage"
+        content = "second"
+
+    with site._background_writes():
+        site._render_routes(FirstPage(), ["./"])
+        site._render_routes(SecondPage(), ["./"])
+
+    assert (site.output_path / "custompage.html").read_text() == "second"
+
+
+def test_site_background_writes_are_bounded(site, mocker):
+    """Tests that rendering waits for queued writes once `MAX_PENDING_WRITES` writes are waiting"""
+    mocker.patch("render_engine.site.MAX_PENDING_WRITES", 2)
+    write_output = site_module.write_output
+    lock = threading.Lock()
+    unfinished = []
+    most_unfinished = 0
+
+    def slow_write_output(paths, content):
+        time.sleep(0.01)
+        with lock:
+            unfinished.remove(content)
+        return write_output(paths, content)
+
+    mocker.patch("render_engine.site.write_output", side_effect=slow_write_output)
+
+    with site._background_writes():
+        for i in range(10):
+
+            class CustomPage(Page):
+                slug = f"custompage{i}"
+                content = f"page {i}"
+
+            with lock:
+                unfinished.append(f"page {i}".encode())
+            site._render_routes(CustomPage(), ["./"])
+            with lock:
+                most_unfinished = max(most_unfinished, len(unfinished))
+
+    assert most_unfinished <= 2
+    assert (site.output_path / "custompage9.html").read_text() == "page 9"
+
+
+@pytest.mark.skipif(not hasattr(os, "copy_file_range"), reason="requires os.copy_file_range")
+def test_copy_output_finishes_short_copies(tmp_path: Path, mocker):
+    """Tests that a copy the file system stops early is finished without `os.copy_file_range`"""
+    source = tmp_path / "source.html"
+    source.write_text("this is a test")
+    path = tmp_path / "copy.html"
+    mocker.patch("render_engine.site.os.copy_file_range", side_effect=[4, 0])
+
+    site_module.copy_output(source, path)
+
+    assert path.read_text() == "this is a test"
+
+
+def test_site_linked_output_is_unlinked_before_writing(site):
+    """Tests that writing to an output that was linked does not change the other linked outputs"""
+
+    @site.page
+    class CustomPage(Page):
+        content = "this is a test"
+        routes = ["customroute", "customroute2"]
+
+    site.render()
+    site.route_list["custompage"].routes = ["customroute"]
+    site.route_list["custompage"].content = "this is a changed test"
+    site.render()
+
+    assert (site.output_path / "customroute" / "custompage.html").read_text() == "this is a changed test"
+    assert (site.output_path / "customroute2" / "custompage.html").read_text() == "this is a test"
+
+
+def test_site_render_skips_unchanged_output(site, tmp_path: Path):
+    """Tests that rendering again only rewrites pages whose content changed"""
+
+    @site.page
+    class UnchangedPage(Page):
+        content = "unchanged"
+
+    @site.page
+    class ChangedPage(Page):
+        content = "before"
+
+    site.render()
+    unchanged_page = site.output_path / "unchangedpage.html"
+    changed_page = site.output_path / "changedpage.html"
+    os.utime(unchanged_page, ns=(0, 0))
+
+    site.route_list["changedpage"].content = "after"
+    site.render()
+
+    assert unchanged_page.stat().st_mtime_ns == 0
+    assert changed_page.read_text() == "after"
+
+
+def test_site_last_page_rendered_to_a_path_is_written_on_every_render(site):
+    """Tests that the last page rendered to a path is left on disk when the path has a saved hash"""
+
+    class FirstPage(Page):
+        slug = "dup"
+        content = "first!"
+
+    class SecondPage(Page):
+        slug = "dup"
+        content = "second"
+
+    @site.collection
+    class CustomCollection(Collection):
+        pages = [FirstPage(), SecondPage()]
+
+    for _ in range(3):
+        site.render()
+        assert (site.output_path / "dup.html").read_text() == "second"
+
+
+def test_site_render_rewrites_removed_output(site, tmp_path: Path):
+    """Tests that unchanged pages are written again if the output file was removed"""
+
+    @site.page
+    class CustomPage(Page):
+        content = "this is a test"
+
+    site.render()
+    (site.output_path / "custompage.html").unlink()
+    site.render()
+
+    assert (site.output_path / "custompage.html").read_text() == "this is a test"
+
+
+def test_site_render_rewrites_output_changed_outside_of_render(site):
+    """Tests that a saved output edited after the render is written again, even with the same size"""
+
+    @site.page
+    class CustomPage(Page):
+        content = "hello world"
+
+    for _ in range(3):
+        site.render()
+
+    custom_page = site.output_path / "custompage.html"
+    custom_page.write_text("HELLO WORLD")
+    site.render()
+
+    assert custom_page.read_text() == "hello world"
+
+
+def test_site_render_does_not_hash_new_output(site, mocker):
+    """Tests that pages written to a new output path are not hashed"""
+    hash_content = mocker.spy(site_module, "hash_content")
+
+    @site.page
+    class CustomPage(Page):
+        content = "this is a test"
+
+    site.render()
+    assert mocker.call(b"this is a test") not in hash_content.call_args_list
+
+    site.render()
+    assert mocker.call(b"this is a test") in hash_content.call_args_list
+    assert len(site.hashes) == 1
+
+
+def test_site_render_skips_unchanged_output_with_new_site(tmp_path: Path):
+    """Tests that the hashes saved in the cache file are used by a new Site rendering to the same output path"""
+
+    def make_site() -> Site:
+        _site = Site()
+        _site.output_path = tmp_path / "output"
+
+        @_site.page
+        class CustomPage(Page):
+            content = "this is a test"
+
+        return _site
+
+    make_site().render()
+    custom_page = tmp_path / "output" / "custompage.html"
+    os.utime(custom_page, ns=(0, 0))
+
+    site = make_site()
+    site.render()
+
+    assert site.cache_file.exists()
+    assert not site.cache_file.is_relative_to(site.output_path)
+    assert custom_page.stat().st_mtime_ns == 0
+
+
+def test_sites_with_different_output_paths_keep_their_own_cache_files(tmp_path: Path, monkeypatch):
+    """Tests that sites rendering to different output paths from the same working directory don't share hashes"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(Site, "_cache_file_name", None)
+
+    def make_site(output_path: str) -> Site:
+        _site = Site()
+        _site.output_path = output_path
+
+        @_site.page
+        class CustomPage(Page):
+            content = "this is a test"
+
+        return _site
+
+    for _ in range(2):
+        make_site("outa").render()
+        make_site("outb").render()
+
+    site_a, site_b = make_site("outa"), make_site("outb")
+    assert site_a.cache_file.parent == site_b.cache_file.parent == Path(".render-engine")
+    assert (tmp_path / ".render-engine" / ".gitignore").read_text() == "*\n"
+    assert len(site_a._load_hashes()) == 1
+    assert len(site_b._load_hashes()) == 1
+    assert site_a._load_hashes() != site_b._load_hashes()
+
+
+def test_site_cache_file_only_written_when_hashes_change(site):
+    """Tests that the cache file is left alone when no page changed"""
+
+    @site.page
+    class CustomPage(Page):
+        content = "this is a test"
+
+    site.render()
+    site.render()
+    assert site.cache_file.exists()
+
+    os.utime(site.cache_file, ns=(0, 0))
+    site.render()
+    assert site.cache_file.stat().st_mtime_ns == 0
+
+
+def test_site_cache_file_drops_removed_pages(site):
+    """Tests that hashes for pages that are no longer rendered are not kept in the cache file"""
+
+    @site.page
+    class CustomPage(Page):
+        content = "this is a test"
+
+    @site.page
+    class RemovedPage(Page):
+        content = "this page will be removed"
+
+    site.render()
+    site.render()
+    assert len(site._load_hashes()) == 2
+
+    del site.route_list["removedpage"]
+    site.render()
+    assert len(site._load_hashes()) == 1
+
+
+def test_site_ignores_cache_file_from_another_version(site, caplog):
+    """Tests that a cache file without the current header is ignored, even when its length fits the entries"""
+
+    @site.page
+    class CustomPage(Page):
+        content = "this is a test"
+
+    site.render()
+    old_entry_size = 2 * site_module.DIGEST_SIZE
+    entry_size = old_entry_size + site_module.MTIME_SIZE
+    site.cache_file.write_bytes(b"\x01" * old_entry_size * entry_size)
+
+    assert site._load_hashes() == {}
+    assert "Ignoring cache file from another version" in caplog.text
+
+    site.render()
+    assert len(site._load_hashes()) == 1
+
+
+def test_site_renders_when_cache_file_is_unreadable(site, tmp_path: Path, monkeypatch, caplog):
+    """Tests that a cache file that can't be read is ignored with a warning"""
+    monkeypatch.setattr(Site, "_cache_file_name", tmp_path)
+
+    @site.page
+    class CustomPage(Page):
+        content = "this is a test"
+
+    site.render()
+
+    assert (site.output_path / "custompage.html").read_text() == "this is a test"
+    assert "Ignoring unreadable cache file" in caplog.text
+
+
+def test_site_render_finishes_when_cache_file_is_unwritable(site, tmp_path: Path, monkeypatch, mocker, caplog):
+    """Tests that a cache file that can't be written doesn't stop the post build plugins from running"""
+    (tmp_path / "not-a-directory").write_text("")
+    monkeypatch.setattr(Site, "_cache_file_name", tmp_path / "not-a-directory" / ".render-engine-cache")
+    post_build_site = mocker.spy(site.plugin_manager._pm.hook, "post_build_site")
+
+    @site.page
+    class CustomPage(Page):
+        content = "this is a test"
+
+    site.render()
+    site.render()
+
+    assert post_build_site.call_count == 2
+    assert not site.cache_file.exists()
+    assert "Unable to write cache file" in caplog.text
+
+
 def test_site_static_renders_in_static_output_path(site_with_collection: Site):
     """
     Tests that a static file is rendered in the static output path.
@@ -273,6 +741,61 @@ def tests_site_multiple_static_paths(tmp_path: Path, site: Site):
     assert (output_tmp_dir / "static2" / "test2.txt").exists()
 
 
+def tests_site_static_paths_only_copied_when_changed(tmp_path: Path, site: Site, mocker):
+    """given a static path that hasn't changed, the files should not be copied again"""
+    static_tmp_dir = tmp_path / "static"
+    static_tmp_dir.mkdir()
+    Path(static_tmp_dir / "test.txt").write_text("test")
+    Path(static_tmp_dir / "unchanged.txt").write_text("unchanged")
+    site.static_paths = {static_tmp_dir}
+    copy2 = mocker.spy(shutil, "copy2")
+
+    site.render()
+    assert copy2.call_count == 2
+
+    site.render()
+    assert copy2.call_count == 2
+
+    Path(static_tmp_dir / "test.txt").write_text("changed test")
+    site.render()
+    assert copy2.call_count == 3
+    assert (site.output_path / "static" / "test.txt").read_text() == "changed test"
+
+
+def tests_site_static_paths_restored_when_output_changes(tmp_path: Path, site: Site):
+    """given a static file removed or edited in the output folder, it should be copied again"""
+    static_tmp_dir = tmp_path / "static"
+    static_tmp_dir.mkdir()
+    Path(static_tmp_dir / "test.txt").write_text("test")
+    Path(static_tmp_dir / "edited.txt").write_text("edited")
+    site.static_paths = {static_tmp_dir}
+
+    site.render()
+    (site.output_path / "static" / "test.txt").unlink()
+    (site.output_path / "static" / "edited.txt").write_text("EDITED")
+    site.render()
+
+    assert (site.output_path / "static" / "test.txt").read_text() == "test"
+    assert (site.output_path / "static" / "edited.txt").read_text() == "edited"
+
+
+def tests_site_static_paths_copied_when_symlinked_directory_changes(tmp_path: Path, site: Site):
+    """given a file changed inside a symlinked static directory, the static path should be copied again"""
+    vendor_dir = tmp_path / "vendor"
+    vendor_dir.mkdir()
+    Path(vendor_dir / "test.txt").write_text("test")
+    static_tmp_dir = tmp_path / "static"
+    static_tmp_dir.mkdir()
+    Path(static_tmp_dir / "vendor").symlink_to(vendor_dir, target_is_directory=True)
+    site.static_paths = {static_tmp_dir}
+
+    site.render()
+    Path(vendor_dir / "test.txt").write_text("changed test")
+    site.render()
+
+    assert (site.output_path / "static" / "vendor" / "test.txt").read_text() == "changed test"
+
+
 def test_site_theme_update_settings(site, tmp_path: Path):
     """Tests that the theme manager updates the settings"""
     site = Site()
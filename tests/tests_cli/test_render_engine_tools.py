@@ -1,6 +1,8 @@
 import pathlib
 
-from render_engine.cli.cli import remove_output_folder
+from render_engine.cli.cli import get_site_content_paths, remove_output_folder
+from render_engine.collection import Collection
+from render_engine.page import Page
 from render_engine.site import Site
 
 
@@ -15,3 +17,31 @@ def test_clean_folder(tmp_path):
     remove_output_folder(pathlib.Path(dirty_output_path))
     assert not dirty_output_path.exists()
     assert not list(tmp_path.iterdir())
+
+
+def test_clean_folder_removes_cache_file(tmp_path):
+    """Tests that the render cache file is removed with the output folder"""
+    output_path = tmp_path / "output"
+    output_path.mkdir()
+    cache_file = tmp_path / ".render-engine" / "cache-output"
+    cache_file.parent.mkdir()
+    cache_file.write_bytes(b"")
+
+    remove_output_folder(output_path, cache_file)
+    assert not output_path.exists()
+    assert not cache_file.exists()
+
+
+def test_get_site_content_paths(tmp_path):
+    """Tests that only routes with a content_path are returned"""
+    site = Site()
+
+    @site.collection
+    class CustomCollection(Collection):
+        content_path = tmp_path
+
+    @site.page
+    class CustomPage(Page):
+        content = "test"
+
+    assert get_site_content_paths(site) == [tmp_path]